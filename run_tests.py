@@ -7,29 +7,106 @@ This script provides different ways to run the test suite with common options.
 
 import subprocess
 import sys
+import os
+import glob
 import argparse
 
+import pytest
 
-def run_command(command, description):
-    """Run a command and handle its output."""
+
+def print_banner(description):
+    """Print a section banner announcing the test run."""
     print(f"\n{'='*60}")
     print(f"🧪 {description}")
     print(f"{'='*60}")
+
+
+def run_pytest(pytest_args, description, verbose=False):
+    """Run pytest in this interpreter; banners are printed only when verbose."""
+    if not verbose:
+        return pytest.main(pytest_args) == 0
     
-    try:
-        result = subprocess.run(command, shell=True, check=True, text=True, 
-                              capture_output=False)
+    print_banner(description)
+    exit_code = pytest.main(pytest_args)
+    if exit_code == 0:
         print(f"✅ {description} completed successfully!")
         return True
-    except subprocess.CalledProcessError as e:
-        print(f"❌ {description} failed with exit code {e.returncode}")
+    
+    print(f"❌ {description} failed with exit code {int(exit_code)}")
+    return False
+
+
+def partition_test_files(num_shards):
+    """Round-robin the test modules into at most num_shards disjoint groups."""
+    test_files = sorted(glob.glob("tests/test_*.py"))
+    shards = [test_files[i::num_shards] for i in range(num_shards)]
+    return [shard for shard in shards if shard]
+
+
+def combine_coverage():
+    """Merge the per-process coverage data files into .coverage."""
+    subprocess.run([sys.executable, "-m", "coverage", "combine"], check=True)
+
+
+def report_coverage(coverage_reports):
+    """Print or write the requested reports from the combined coverage data."""
+    coverage_cmd = [sys.executable, "-m", "coverage"]
+    for report in coverage_reports:
+        if report == "html":
+            subprocess.run([*coverage_cmd, "html"], check=True)
+        elif report == "term-missing":
+            subprocess.run([*coverage_cmd, "report", "--show-missing"], check=True)
+        else:
+            subprocess.run([*coverage_cmd, "report"], check=True)
+
+
+def run_shards(shards, extra_args, description, coverage_reports=(), coverage_context=False,
+               verbose=False):
+    """Run each shard in its own pytest process and aggregate the results."""
+    if verbose:
+        print_banner(description)
+    
+    processes = []
+    for index, files in enumerate(shards):
+        # Concurrent shards would overwrite each other's last-failed data,
+        # so they never write .pytest_cache
+        command = [sys.executable, "-m", "pytest", *files,
+                   "-p", "no:cacheprovider", *extra_args]
+        if "-v" not in extra_args:
+            command.append("-q")
+        env = None
+        if coverage_reports:
+            # Each shard writes its own data file; they are combined below
+            command += ["--cov=src", "--cov-append", "--cov-report="]
+            if coverage_context:
+                command.append("--cov-context=test")
+            env = {**os.environ, "COVERAGE_FILE": f".coverage.shard{index}"}
+        processes.append(subprocess.Popen(command, env=env))
+    
+    return_codes = [process.wait() for process in processes]
+    
+    if coverage_reports:
+        # Always combine so no shard data file is left behind for --cov-append
+        combine_coverage()
+    
+    failed = [code for code in return_codes if code != 0]
+    if failed:
+        print(f"❌ {description} failed in {len(failed)} of {len(shards)} shards")
         return False
+    
+    if coverage_reports:
+        report_coverage(coverage_reports)
+    
+    if verbose:
+        print(f"✅ {description} completed successfully!")
+    return True
 
 
 def main():
     parser = argparse.ArgumentParser(description="Run tests for the Activities API")
     parser.add_argument('--quick', action='store_true', 
-                       help='Run tests without coverage (faster)')
+                       help='Run tests without coverage or .pytest_cache writes (faster, '
+                            'but --failed will not see failures from this run)')
     parser.add_argument('--coverage', action='store_true', 
                        help='Run tests with coverage report')
     parser.add_argument('--performance', action='store_true', 
@@ -39,44 +116,90 @@ def main():
     parser.add_argument('--validation', action='store_true', 
                        help='Run only data validation tests')
     parser.add_argument('--verbose', '-v', action='store_true', 
-                       help='Verbose output')
+                       help='Verbose pytest output and section banners')
+    parser.add_argument('--serial', action='store_true', 
+                       help='Run tests in a single process (disable pytest-xdist)')
+    parser.add_argument('--changed', action='store_true', 
+                       help='Run only tests affected by recent changes (pytest-testmon, no coverage)')
+    parser.add_argument('--failed', action='store_true', 
+                       help='Re-run only the tests that failed last time (pytest --lf --ff). '
+                            'Failures are only remembered from single-session runs (--serial, '
+                            '--api/--validation/--performance, --changed or --failed), not from '
+                            'the default sharded whole-suite run, --quick or CI runs')
     
     args = parser.parse_args()
     
-    # Base pytest command
-    pytest_cmd = "python -m pytest tests/"
+    # Base pytest arguments
+    test_path = "tests/"
+    pytest_args = []
     
     if args.verbose:
-        pytest_cmd += " -v"
+        pytest_args.append("-v")
     
     # Determine which tests to run
+    run_all = not (args.api or args.validation or args.performance)
     if args.api:
-        pytest_cmd = pytest_cmd.replace("tests/", "tests/test_api.py")
+        test_path = "tests/test_api.py"
         description = "Running API Tests"
     elif args.validation:
-        pytest_cmd = pytest_cmd.replace("tests/", "tests/test_data_validation.py")
+        test_path = "tests/test_data_validation.py"
         description = "Running Data Validation Tests"
     elif args.performance:
-        pytest_cmd = pytest_cmd.replace("tests/", "tests/test_performance.py")
+        test_path = "tests/test_performance.py"
         description = "Running Performance Tests"
     else:
         description = "Running All Tests"
     
-    # Add coverage if requested
-    if args.coverage and not args.quick:
-        pytest_cmd += " --cov=src --cov-report=html --cov-report=term-missing"
+    # Change-gated selection relies on a single pytest session's cache
+    if args.changed:
+        pytest_args.append("--testmon")
+        description += " Affected by Changes"
+    if args.failed:
+        pytest_args += ["--lf", "--ff"]
+        description += " That Failed Last Time"
+    
+    # Skip .pytest_cache writes when nothing will read them back: quick runs
+    # and CI runs, unless this run itself depends on the cache. Sharded
+    # whole-suite runs never write it (see run_shards)
+    if (args.quick or os.environ.get("CI")) and not (args.changed or args.failed):
+        pytest_args += ["-p", "no:cacheprovider"]
+    
+    # Add coverage if requested (testmon and coverage cannot be combined)
+    coverage_reports = ()
+    skip_coverage = args.quick or args.changed
+    if args.coverage and not skip_coverage:
+        coverage_reports = ("html", "term-missing")
         description += " with Coverage"
-    elif not args.quick and not (args.api or args.validation or args.performance):
+    elif not skip_coverage and run_all:
         # Default to coverage for full test runs
-        pytest_cmd += " --cov=src --cov-report=term"
+        coverage_reports = ("term",)
         description += " with Coverage"
     
-    # Run the tests
-    success = run_command(pytest_cmd, description)
+    if run_all and not (args.serial or args.changed or args.failed):
+        # Split the suite into per-process shards, leaving two cores free
+        num_shards = max(1, (os.cpu_count() or 1) - 2)
+        shards = partition_test_files(num_shards)
+        success = run_shards(shards, pytest_args,
+                             f"{description} in {len(shards)} Shards",
+                             coverage_reports, args.coverage, args.verbose)
+    else:
+        # Distribute tests across CPU cores unless timing must be measured in isolation
+        if not args.serial and not args.performance:
+            pytest_args += ["-n", "auto"]
+            description += " in Parallel"
+        
+        if coverage_reports:
+            pytest_args.append("--cov=src")
+            if args.coverage:
+                pytest_args.append("--cov-context=test")
+            pytest_args += [f"--cov-report={report}" for report in coverage_reports]
+        
+        # Run the tests
+        success = run_pytest([test_path, *pytest_args], description, args.verbose)
     
     if success:
         print(f"\n🎉 All tests passed successfully!")
-        if "--cov=" in pytest_cmd:
+        if "html" in coverage_reports:
             print(f"📊 Coverage report generated in htmlcov/index.html")
     else:
         print(f"\n💥 Some tests failed. Check the output above for details.")
@@ -5,128 +5,226 @@ A super simple FastAPI application that allows students to view and sign up
 for extracurricular activities at Mergington High School.
 """
 
-from fastapi import FastAPI, HTTPException
+import uuid
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, HTTPException, Request
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import RedirectResponse
-import os
+from fastapi.responses import JSONResponse, RedirectResponse, Response
+import orjson
 from pathlib import Path
 
+
+class ORJSONResponse(JSONResponse):
+    """JSON response rendered with orjson instead of the stdlib encoder"""
+
+    def render(self, content) -> bytes:
+        return orjson.dumps(content)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Serialize activities at startup so the first GET is served from cache
+    _rebuild_activities_cache()
+    yield
+
+
 app = FastAPI(title="Mergington High School API",
-              description="API for viewing and signing up for extracurricular activities")
+              description="API for viewing and signing up for extracurricular activities",
+              default_response_class=ORJSONResponse,
+              lifespan=lifespan)
 
 # Mount the static files directory
 current_dir = Path(__file__).parent
-app.mount("/static", StaticFiles(directory=os.path.join(Path(__file__).parent,
-          "static")), name="static")
+STATIC_DIR = current_dir / "static"
+app.mount("/static", StaticFiles(directory=STATIC_DIR), name="static")
 
-# In-memory activity database
+# In-memory activity database: static details, never mutated at runtime
 activities = {
     "Chess Club": {
         "description": "Learn strategies and compete in chess tournaments",
         "schedule": "Fridays, 3:30 PM - 5:00 PM",
-        "max_participants": 12,
-        "participants": ["michael@mergington.edu", "daniel@mergington.edu"]
+        "max_participants": 12
     },
     "Programming Class": {
         "description": "Learn programming fundamentals and build software projects",
         "schedule": "Tuesdays and Thursdays, 3:30 PM - 4:30 PM",
-        "max_participants": 20,
-        "participants": ["emma@mergington.edu", "sophia@mergington.edu"]
+        "max_participants": 20
     },
     "Gym Class": {
         "description": "Physical education and sports activities",
         "schedule": "Mondays, Wednesdays, Fridays, 2:00 PM - 3:00 PM",
-        "max_participants": 30,
-        "participants": ["john@mergington.edu", "olivia@mergington.edu"]
+        "max_participants": 30
     },
     "Soccer Team": {
         "description": "Competitive soccer team with practices and matches",
         "schedule": "Mondays, Wednesdays, 4:00 PM - 6:00 PM",
-        "max_participants": 22,
-        "participants": ["liam@mergington.edu", "ava@mergington.edu"]
+        "max_participants": 22
     },
     "Swimming Club": {
         "description": "Lap swimming and technique training at the school pool",
         "schedule": "Tuesdays and Thursdays, 5:00 PM - 6:30 PM",
-        "max_participants": 18,
-        "participants": ["noah@mergington.edu", "mia@mergington.edu"]
+        "max_participants": 18
     },
     "Art Club": {
         "description": "Explore drawing, painting, and mixed media projects",
         "schedule": "Wednesdays, 3:45 PM - 5:00 PM",
-        "max_participants": 16,
-        "participants": ["isabella@mergington.edu", "lucas@mergington.edu"]
+        "max_participants": 16
     },
     "Drama Club": {
         "description": "Acting, play production, and stagecraft workshops",
         "schedule": "Fridays, 4:00 PM - 6:00 PM",
-        "max_participants": 25,
-        "participants": ["charlotte@mergington.edu", "eli@mergington.edu"]
+        "max_participants": 25
     },
     "Debate Team": {
         "description": "Prepare for debate tournaments and practice public speaking",
         "schedule": "Thursdays, 4:00 PM - 5:30 PM",
-        "max_participants": 14,
-        "participants": ["amelia@mergington.edu", "jack@mergington.edu"]
+        "max_participants": 14
     },
     "Robotics Club": {
         "description": "Design, build, and program robots for competitions",
         "schedule": "Mondays and Wednesdays, 3:30 PM - 5:30 PM",
-        "max_participants": 12,
-        "participants": ["henry@mergington.edu", "zoe@mergington.edu"]
+        "max_participants": 12
     }
 }
 
+# Signed-up student emails per activity, kept apart from the static details
+participants = {
+    "Chess Club": {"michael@mergington.edu", "daniel@mergington.edu"},
+    "Programming Class": {"emma@mergington.edu", "sophia@mergington.edu"},
+    "Gym Class": {"john@mergington.edu", "olivia@mergington.edu"},
+    "Soccer Team": {"liam@mergington.edu", "ava@mergington.edu"},
+    "Swimming Club": {"noah@mergington.edu", "mia@mergington.edu"},
+    "Art Club": {"isabella@mergington.edu", "lucas@mergington.edu"},
+    "Drama Club": {"charlotte@mergington.edu", "eli@mergington.edu"},
+    "Debate Team": {"amelia@mergington.edu", "jack@mergington.edu"},
+    "Robotics Club": {"henry@mergington.edu", "zoe@mergington.edu"}
+}
+
+# Serialized GET /activities body, rebuilt lazily after any mutation
+_activities_cache: bytes | None = None
+
+# Bumped on every mutation; with a per-process seed it makes the ETag of
+# GET /activities change whenever the data (or the server process) does
+_activities_version = 0
+_ETAG_SEED = uuid.uuid4().hex[:8]
+
+
+def _rebuild_activities_cache() -> bytes:
+    """Serialize activities to JSON with each participant set as a sorted list"""
+    global _activities_cache
+    _activities_cache = orjson.dumps({
+        name: {**activity, "participants": sorted(participants[name])}
+        for name, activity in activities.items()
+    })
+    return _activities_cache
+
+
+def invalidate_activities_cache():
+    """Drop the cached activities JSON so the next read reflects new state"""
+    global _activities_cache, _activities_version
+    _activities_cache = None
+    _activities_version += 1
+
+
+def _etag_matches(if_none_match: str | None, etag: str) -> bool:
+    """Weakly compare an If-None-Match header (a tag list or *) with an ETag"""
+    if if_none_match is None:
+        return False
+
+    opaque_tag = etag.removeprefix("W/")
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate == "*" or candidate.removeprefix("W/") == opaque_tag:
+            return True
+    return False
+
 
 @app.get("/")
-def root():
+async def root():
     return RedirectResponse(url="/static/index.html")
 
 
 @app.get("/activities")
-def get_activities():
-    return activities
+async def get_activities(request: Request):
+    etag = f'W/"{_ETAG_SEED}-{_activities_version}"'
+    if _etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers={"ETag": etag})
+
+    return Response(content=_activities_cache or _rebuild_activities_cache(),
+                    media_type="application/json", headers={"ETag": etag})
 
 
 @app.post("/activities/{activity_name}/signup")
-def signup_for_activity(activity_name: str, email: str):
+async def signup_for_activity(activity_name: str, email: str):
     """Sign up a student for an activity"""
-    # Validate activity exists
-    if activity_name not in activities:
+    # Get the specific activity, validating it exists
+    activity = activities.get(activity_name)
+    if activity is None:
         raise HTTPException(status_code=404, detail="Activity not found")
 
-    # Get the specific activity
-    activity = activities[activity_name]
+    signed_up = participants[activity_name]
 
     # validate student not already signed up
-    if email in activity["participants"]:
+    if email in signed_up:
         raise HTTPException(status_code=400, detail="Student already signed up for this activity")
 
     # validate max participants not exceeded
-    if len(activity["participants"]) >= activity["max_participants"]:
+    if len(signed_up) >= activity["max_participants"]:
         raise HTTPException(status_code=400, detail="Activity is full")
 
     # Add student
-    activity["participants"].append(email)
+    signed_up.add(email)
+    invalidate_activities_cache()
     return {"message": f"Signed up {email} for {activity_name}"}
 
 
+@app.post("/activities/{activity_name}/signup_bulk")
+async def bulk_signup_for_activity(activity_name: str, emails: list[str]):
+    """Sign up several students for an activity in one request"""
+    # Get the specific activity, validating it exists
+    activity = activities.get(activity_name)
+    if activity is None:
+        raise HTTPException(status_code=404, detail="Activity not found")
+
+    signed_up = participants[activity_name]
+
+    # Report each distinct email; students already signed up are skipped
+    results = {
+        email: "already_signed_up" if email in signed_up else "signed_up"
+        for email in emails
+    }
+    new_emails = [email for email, result in results.items() if result == "signed_up"]
+
+    # validate max participants not exceeded by the whole batch
+    if len(signed_up) + len(new_emails) > activity["max_participants"]:
+        raise HTTPException(status_code=400, detail="Not enough spots left for all students")
+
+    # Add students; a batch of existing participants changes nothing, so
+    # the cached body and its ETag stay valid
+    if new_emails:
+        signed_up.update(new_emails)
+        invalidate_activities_cache()
+    return {
+        "message": f"Signed up {len(new_emails)} students for {activity_name}",
+        "results": results
+    }
+
+
 @app.delete("/activities/{activity_name}/unregister")
-def unregister_from_activity(activity_name: str, email: str):
+async def unregister_from_activity(activity_name: str, email: str):
     """Unregister a student from an activity"""
-    # Validate activity exists
-    if activity_name not in activities:
+    # Get the activity's participants, validating it exists
+    signed_up = participants.get(activity_name)
+    if signed_up is None:
         raise HTTPException(status_code=404, detail="Activity not found")
 
-    # Get the specific activity
-    activity = activities[activity_name]
-
     # validate student is registered
-    if email not in activity["participants"]:
+    if email not in signed_up:
         raise HTTPException(status_code=400, detail="Student is not registered for this activity")
 
     # Remove student
-    activity["participants"].remove(email)
+    signed_up.discard(email)
+    invalidate_activities_cache()
     return {"message": f"Unregistered {email} from {activity_name}"}
 
   
\ No newline at end of file
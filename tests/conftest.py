@@ -2,15 +2,121 @@
 Test configuration and fixtures for FastAPI testing
 """
 
+import copy
+import hashlib
 import pytest
+from pathlib import Path
 from fastapi.testclient import TestClient
-from src.app import app, activities
+from src.app import app, activities, participants, invalidate_activities_cache
 
+try:
+    import uvloop  # noqa: F401 - installed with uvicorn[standard], not on Windows
+    _BACKEND_OPTIONS = {"use_uvloop": True}
+except ImportError:
+    _BACKEND_OPTIONS = {}
 
-@pytest.fixture
+# Pristine copies of the default data, taken once before any test runs
+_ORIGINAL_ACTIVITIES = copy.deepcopy(activities)
+_ORIGINAL_PARTICIPANTS = copy.deepcopy(participants)
+
+# --skip-cached bookkeeping: cache key, the user_properties name that carries
+# each test's digest to its reports, and per-run results by test node id
+_SKIP_CACHE_KEY = "activities/hashes"
+_DIGEST_PROPERTY = "skip_cached_digest"
+_passed_digests = {}
+_failed_tests = set()
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup("skip-cached")
+    group.addoption("--skip-cached", action="store_true", dest="skip_cached", default=False,
+                    help="skip tests that passed last time with unchanged src/app.py, "
+                         "conftest.py and test file")
+    group.addoption("--no-skip-cached", action="store_false", dest="skip_cached",
+                    help="run every test even if it passed with unchanged sources")
+
+
+def _skip_cached_enabled(config):
+    return config.getoption("skip_cached") and getattr(config, "cache", None) is not None
+
+
+def pytest_collection_modifyitems(config, items):
+    """Skip tests whose sources are unchanged since they last passed"""
+    if not _skip_cached_enabled(config):
+        return
+    
+    shared_sources = (config.rootpath / "src" / "app.py").read_bytes() + Path(__file__).read_bytes()
+    file_digests = {}
+    passed = config.cache.get(_SKIP_CACHE_KEY, {})
+    
+    for item in items:
+        if item.path not in file_digests:
+            file_digests[item.path] = hashlib.blake2b(
+                shared_sources + item.path.read_bytes(), digest_size=16
+            ).hexdigest()
+        digest = file_digests[item.path]
+        # Reports carry user_properties back to the xdist controller
+        item.user_properties.append((_DIGEST_PROPERTY, digest))
+        if passed.get(item.nodeid) == digest:
+            item.add_marker(pytest.mark.skip(reason="cached: passed with unchanged sources"))
+
+
+def pytest_runtest_logreport(report):
+    digest = dict(report.user_properties).get(_DIGEST_PROPERTY)
+    if digest is None:
+        return
+    if report.failed:
+        _failed_tests.add(report.nodeid)
+    elif report.when == "call" and report.passed:
+        _passed_digests[report.nodeid] = digest
+
+
+def pytest_sessionfinish(session):
+    """Remember which tests passed, keyed by the digest of their sources"""
+    # Only the xdist controller (or a plain session) writes the cache, so
+    # workers cannot overwrite each other's results
+    if not _skip_cached_enabled(session.config) or hasattr(session.config, "workerinput"):
+        return
+    
+    passed = session.config.cache.get(_SKIP_CACHE_KEY, {})
+    passed.update(_passed_digests)
+    # Drop failures last: a test whose call passed but whose setup or
+    # teardown errored is in both collections and must not be skipped
+    for nodeid in _failed_tests:
+        passed.pop(nodeid, None)
+    session.config.cache.set(_SKIP_CACHE_KEY, passed)
+
+
+@pytest.fixture(scope="session")
 def client():
-    """Create a test client for the FastAPI application"""
-    return TestClient(app)
+    """Create a test client shared by the whole test session
+
+    Entering the client runs the application lifespan once and keeps the
+    same event loop (uvloop when available) and transport for every test.
+    """
+    with TestClient(app, backend_options=_BACKEND_OPTIONS) as test_client:
+        yield test_client
+
+
+@pytest.fixture(scope="session")
+def activities_summary():
+    """Validation facts about the default activities, computed once per session"""
+    return {
+        "participant_emails": [
+            (name, email)
+            for name, signed_up in participants.items()
+            for email in signed_up
+        ],
+        "non_set_participants": [
+            name for name, signed_up in participants.items()
+            if not isinstance(signed_up, set)
+        ],
+        "over_capacity": {
+            name: (len(participants[name]), activity["max_participants"])
+            for name, activity in activities.items()
+            if len(participants[name]) > activity["max_participants"]
+        },
+    }
 
 
 @pytest.fixture
@@ -21,84 +127,24 @@ def sample_activities():
             "description": "A test club for testing purposes",
             "schedule": "Test schedule",
             "max_participants": 5,
-            "participants": ["test1@mergington.edu", "test2@mergington.edu"]
+            "participants": {"test1@mergington.edu", "test2@mergington.edu"}
         },
         "Empty Club": {
             "description": "An empty club for testing",
             "schedule": "Empty schedule",
             "max_participants": 10,
-            "participants": []
+            "participants": set()
         }
     }
 
 
 @pytest.fixture(autouse=True)
 def reset_activities():
-    """Reset activities data before each test"""
-    # Store original data
-    original_activities = {
-        "Chess Club": {
-            "description": "Learn strategies and compete in chess tournaments",
-            "schedule": "Fridays, 3:30 PM - 5:00 PM",
-            "max_participants": 12,
-            "participants": ["michael@mergington.edu", "daniel@mergington.edu"]
-        },
-        "Programming Class": {
-            "description": "Learn programming fundamentals and build software projects",
-            "schedule": "Tuesdays and Thursdays, 3:30 PM - 4:30 PM",
-            "max_participants": 20,
-            "participants": ["emma@mergington.edu", "sophia@mergington.edu"]
-        },
-        "Gym Class": {
-            "description": "Physical education and sports activities",
-            "schedule": "Mondays, Wednesdays, Fridays, 2:00 PM - 3:00 PM",
-            "max_participants": 30,
-            "participants": ["john@mergington.edu", "olivia@mergington.edu"]
-        },
-        "Soccer Team": {
-            "description": "Competitive soccer team with practices and matches",
-            "schedule": "Mondays, Wednesdays, 4:00 PM - 6:00 PM",
-            "max_participants": 22,
-            "participants": ["liam@mergington.edu", "ava@mergington.edu"]
-        },
-        "Swimming Club": {
-            "description": "Lap swimming and technique training at the school pool",
-            "schedule": "Tuesdays and Thursdays, 5:00 PM - 6:30 PM",
-            "max_participants": 18,
-            "participants": ["noah@mergington.edu", "mia@mergington.edu"]
-        },
-        "Art Club": {
-            "description": "Explore drawing, painting, and mixed media projects",
-            "schedule": "Wednesdays, 3:45 PM - 5:00 PM",
-            "max_participants": 16,
-            "participants": ["isabella@mergington.edu", "lucas@mergington.edu"]
-        },
-        "Drama Club": {
-            "description": "Acting, play production, and stagecraft workshops",
-            "schedule": "Fridays, 4:00 PM - 6:00 PM",
-            "max_participants": 25,
-            "participants": ["charlotte@mergington.edu", "eli@mergington.edu"]
-        },
-        "Debate Team": {
-            "description": "Prepare for debate tournaments and practice public speaking",
-            "schedule": "Thursdays, 4:00 PM - 5:30 PM",
-            "max_participants": 14,
-            "participants": ["amelia@mergington.edu", "jack@mergington.edu"]
-        },
-        "Robotics Club": {
-            "description": "Design, build, and program robots for competitions",
-            "schedule": "Mondays and Wednesdays, 3:30 PM - 5:30 PM",
-            "max_participants": 12,
-            "participants": ["henry@mergington.edu", "zoe@mergington.edu"]
-        }
-    }
-    
-    # Reset to original data before test
-    activities.clear()
-    activities.update(original_activities)
-    
+    """Restore the default activities data after each test"""
     yield
     
-    # Reset to original data after test
     activities.clear()
-    activities.update(original_activities)
\ No newline at end of file
+    activities.update(copy.deepcopy(_ORIGINAL_ACTIVITIES))
+    participants.clear()
+    participants.update(copy.deepcopy(_ORIGINAL_PARTICIPANTS))
+    invalidate_activities_cache()
@@ -4,7 +4,13 @@ Tests for the Mergington High School Activities API
 
 import pytest
 from fastapi import status
-from src.app import activities
+from fastapi.testclient import TestClient
+import src.app as app_module
+from src.app import app, activities, participants, invalidate_activities_cache
+
+# Pre-encoded endpoint templates; format() with the (already encoded) email
+CHESS_SIGNUP = "/activities/Chess%20Club/signup?email={}"
+CHESS_UNREGISTER = "/activities/Chess%20Club/unregister?email={}"
 
 
 class TestRootEndpoint:
@@ -30,7 +36,7 @@ class TestGetActivities:
         assert len(data) > 0
         
         # Check structure of first activity
-        first_activity = list(data.values())[0]
+        first_activity = next(iter(data.values()))
         required_fields = ["description", "schedule", "max_participants", "participants"]
         for field in required_fields:
             assert field in first_activity
@@ -44,6 +50,68 @@ class TestGetActivities:
         for activity in expected_activities:
             assert activity in data
 
+    def test_startup_primes_activities_cache(self):
+        """Test that application startup serializes activities ahead of the first GET"""
+        invalidate_activities_cache()
+        with TestClient(app):
+            assert app_module._activities_cache is not None
+
+    def test_get_activities_served_from_cache_until_mutation(self, client):
+        """Test that repeated reads reuse the cached body and signups invalidate it"""
+        first = client.get("/activities")
+        assert first.headers["content-type"] == "application/json"
+        assert first.content == app_module._activities_cache
+        assert client.get("/activities").content == first.content
+
+        # Writes only drop the cache; the next GET rebuilds it once
+        client.post(CHESS_SIGNUP.format("cached@mergington.edu"))
+        assert app_module._activities_cache is None
+
+        after_signup = client.get("/activities").json()
+        assert "cached@mergington.edu" in after_signup["Chess Club"]["participants"]
+
+    def test_get_activities_not_modified_with_matching_etag(self, client):
+        """Test that a matching If-None-Match returns 304 without a body"""
+        etag = client.get("/activities").headers["etag"]
+        
+        response = client.get("/activities", headers={"If-None-Match": etag})
+        assert response.status_code == status.HTTP_304_NOT_MODIFIED
+        assert response.content == b""
+        assert response.headers["etag"] == etag
+    
+    @pytest.mark.parametrize("header_template", [
+        'W/"stale", {etag}',
+        "{strong_etag}",
+        "*",
+    ])
+    def test_get_activities_not_modified_with_matching_etag_list(self, client, header_template):
+        """Test that tag lists, the strong form of the tag and * also match"""
+        etag = client.get("/activities").headers["etag"]
+        header = header_template.format(etag=etag, strong_etag=etag.removeprefix("W/"))
+        
+        response = client.get("/activities", headers={"If-None-Match": header})
+        assert response.status_code == status.HTTP_304_NOT_MODIFIED
+    
+    def test_get_activities_etag_changes_after_signup(self, client):
+        """Test that a signup invalidates previously issued ETags"""
+        etag = client.get("/activities").headers["etag"]
+        client.post(CHESS_SIGNUP.format("etag@mergington.edu"))
+        
+        response = client.get("/activities", headers={"If-None-Match": etag})
+        assert response.status_code == status.HTTP_200_OK
+        assert response.headers["etag"] != etag
+        assert "etag@mergington.edu" in response.json()["Chess Club"]["participants"]
+
+    def test_get_activities_participants_are_sorted_lists(self, client):
+        """Test that participants are serialized as sorted lists"""
+        response = client.get("/activities")
+        data = response.json()
+
+        for activity_data in data.values():
+            signed_up = activity_data["participants"]
+            assert isinstance(signed_up, list)
+            assert signed_up == sorted(signed_up)
+
 
 class TestSignupForActivity:
     """Test the POST /activities/{activity_name}/signup endpoint"""
@@ -51,7 +119,7 @@ class TestSignupForActivity:
     def test_signup_success(self, client):
         """Test successful signup for an activity"""
         response = client.post(
-            "/activities/Chess Club/signup?email=newstudent@mergington.edu"
+            CHESS_SIGNUP.format("newstudent@mergington.edu")
         )
         assert response.status_code == status.HTTP_200_OK
         
@@ -78,11 +146,11 @@ class TestSignupForActivity:
     def test_signup_already_registered(self, client):
         """Test signup when student is already registered"""
         # First signup
-        client.post("/activities/Chess Club/signup?email=duplicate@mergington.edu")
+        client.post(CHESS_SIGNUP.format("duplicate@mergington.edu"))
         
         # Second signup (should fail)
         response = client.post(
-            "/activities/Chess Club/signup?email=duplicate@mergington.edu"
+            CHESS_SIGNUP.format("duplicate@mergington.edu")
         )
         assert response.status_code == status.HTTP_400_BAD_REQUEST
         
@@ -92,20 +160,20 @@ class TestSignupForActivity:
     def test_signup_activity_full(self, client):
         """Test signup when activity is at max capacity"""
         # Fill up Chess Club (max 12 participants, already has some)
-        current_participants = len(activities["Chess Club"]["participants"])
+        current_participants = len(participants["Chess Club"])
         max_participants = activities["Chess Club"]["max_participants"]
         spots_to_fill = max_participants - current_participants
         
         # Fill remaining spots
         for i in range(spots_to_fill):
             response = client.post(
-                f"/activities/Chess Club/signup?email=student{i}@mergington.edu"
+                CHESS_SIGNUP.format(f"student{i}@mergington.edu")
             )
             assert response.status_code == status.HTTP_200_OK
         
         # Try to add one more (should fail)
         response = client.post(
-            "/activities/Chess Club/signup?email=overflow@mergington.edu"
+            CHESS_SIGNUP.format("overflow@mergington.edu")
         )
         assert response.status_code == status.HTTP_400_BAD_REQUEST
         
@@ -118,6 +186,62 @@ class TestSignupForActivity:
         assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
 
 
+class TestBulkSignupForActivity:
+    """Test the POST /activities/{activity_name}/signup_bulk endpoint"""
+    
+    def test_bulk_signup_success(self, client):
+        """Test signing up several students at once"""
+        emails = ["bulk1@mergington.edu", "bulk2@mergington.edu"]
+        response = client.post("/activities/Chess Club/signup_bulk", json=emails)
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json()["message"] == "Signed up 2 students for Chess Club"
+        
+        for email in emails:
+            assert email in participants["Chess Club"]
+    
+    def test_bulk_signup_skips_existing_and_repeated_emails(self, client):
+        """Test that already registered or repeated emails are not counted twice"""
+        emails = ["michael@mergington.edu", "bulk@mergington.edu", "bulk@mergington.edu"]
+        response = client.post("/activities/Chess Club/signup_bulk", json=emails)
+        assert response.status_code == status.HTTP_200_OK
+        
+        data = response.json()
+        assert data["message"] == "Signed up 1 students for Chess Club"
+        assert data["results"] == {
+            "michael@mergington.edu": "already_signed_up",
+            "bulk@mergington.edu": "signed_up",
+        }
+    
+    def test_bulk_signup_of_existing_participants_keeps_etag(self, client):
+        """Test that a bulk signup adding nobody leaves the cached ETag valid"""
+        etag = client.get("/activities").headers["etag"]
+        
+        response = client.post("/activities/Chess Club/signup_bulk", json=["michael@mergington.edu"])
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json()["message"] == "Signed up 0 students for Chess Club"
+        
+        response = client.get("/activities", headers={"If-None-Match": etag})
+        assert response.status_code == status.HTTP_304_NOT_MODIFIED
+    
+    def test_bulk_signup_activity_not_found(self, client):
+        """Test bulk signup for non-existent activity"""
+        response = client.post(
+            "/activities/Nonexistent Club/signup_bulk", json=["test@mergington.edu"]
+        )
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+        assert response.json()["detail"] == "Activity not found"
+    
+    def test_bulk_signup_exceeding_capacity(self, client):
+        """Test that a batch larger than the free spots is rejected as a whole"""
+        spots_left = activities["Chess Club"]["max_participants"] - len(participants["Chess Club"])
+        emails = [f"bulk{i}@mergington.edu" for i in range(spots_left + 1)]
+        
+        response = client.post("/activities/Chess Club/signup_bulk", json=emails)
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert response.json()["detail"] == "Not enough spots left for all students"
+        assert not any(email in participants["Chess Club"] for email in emails)
+
+
 class TestUnregisterFromActivity:
     """Test the DELETE /activities/{activity_name}/unregister endpoint"""
     
@@ -125,10 +249,10 @@ class TestUnregisterFromActivity:
         """Test successful unregistration from an activity"""
         # First, register a student
         email = "testunregister@mergington.edu"
-        client.post(f"/activities/Chess Club/signup?email={email}")
+        client.post(CHESS_SIGNUP.format(email))
         
         # Then unregister
-        response = client.delete(f"/activities/Chess Club/unregister?email={email}")
+        response = client.delete(CHESS_UNREGISTER.format(email))
         assert response.status_code == status.HTTP_200_OK
         
         data = response.json()
@@ -154,7 +278,7 @@ class TestUnregisterFromActivity:
     def test_unregister_student_not_registered(self, client):
         """Test unregister when student is not registered"""
         response = client.delete(
-            "/activities/Chess Club/unregister?email=notregistered@mergington.edu"
+            CHESS_UNREGISTER.format("notregistered@mergington.edu")
         )
         assert response.status_code == status.HTTP_400_BAD_REQUEST
         
@@ -202,10 +326,9 @@ class TestIntegrationScenarios:
         activity = "Art Club"
         emails = [f"student{i}@mergington.edu" for i in range(3)]
         
-        # Sign up multiple students
-        for email in emails:
-            response = client.post(f"/activities/{activity}/signup?email={email}")
-            assert response.status_code == status.HTTP_200_OK
+        # Sign up multiple students in one request
+        response = client.post(f"/activities/{activity}/signup_bulk", json=emails)
+        assert response.status_code == status.HTTP_200_OK
         
         # Verify all are registered
         activities_response = client.get("/activities")
@@ -246,7 +369,7 @@ class TestEdgeCases:
         # Need to properly URL encode the email with + character
         import urllib.parse
         encoded_email = urllib.parse.quote(special_email)
-        response = client.post(f"/activities/Chess Club/signup?email={encoded_email}")
+        response = client.post(CHESS_SIGNUP.format(encoded_email))
         assert response.status_code == status.HTTP_200_OK
         
         # Verify in activities list
@@ -255,7 +378,7 @@ class TestEdgeCases:
     
     def test_empty_email_parameter(self, client):
         """Test with empty email parameter"""
-        response = client.post("/activities/Chess Club/signup?email=")
+        response = client.post(CHESS_SIGNUP.format(""))
         # Current API accepts empty emails, so this should return 200
         # In a production system, this should be validated and return 422
         assert response.status_code == status.HTTP_200_OK
\ No newline at end of file
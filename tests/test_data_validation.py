@@ -2,86 +2,94 @@
 Tests for data validation and model structure
 """
 
+import re
 import pytest
-from src.app import activities
+from src.app import activities, participants
+
+# Any of these marks a schedule as containing time information
+_TIME_RE = re.compile(r"AM|PM|:|Monday|Tuesday|Wednesday|Thursday|Friday")
+
+
+def pytest_generate_tests(metafunc):
+    """Run tests that take an activity_name once per default activity"""
+    if "activity_name" in metafunc.fixturenames:
+        metafunc.parametrize("activity_name", list(activities))
 
 
 class TestDataStructure:
     """Test the structure and validity of activities data"""
     
     def test_activities_data_structure(self):
-        """Test that activities data has the correct structure"""
+        """Test that activities and participants are non-empty mappings with matching keys"""
         assert isinstance(activities, dict)
         assert len(activities) > 0
         
-        for activity_name, activity_data in activities.items():
-            # Test activity name is string
-            assert isinstance(activity_name, str)
-            assert len(activity_name) > 0
-            
-            # Test activity data structure
-            assert isinstance(activity_data, dict)
-            required_fields = ["description", "schedule", "max_participants", "participants"]
-            
-            for field in required_fields:
-                assert field in activity_data, f"Missing field '{field}' in activity '{activity_name}'"
-            
-            # Test field types
-            assert isinstance(activity_data["description"], str)
-            assert isinstance(activity_data["schedule"], str)
-            assert isinstance(activity_data["max_participants"], int)
-            assert isinstance(activity_data["participants"], list)
-            
-            # Test constraints
-            assert activity_data["max_participants"] > 0
-            assert len(activity_data["participants"]) <= activity_data["max_participants"]
-            
-            # Test participant emails
-            for participant in activity_data["participants"]:
-                assert isinstance(participant, str)
-                assert "@" in participant  # Basic email validation
+        # Every activity has a participants entry and vice versa
+        assert isinstance(participants, dict)
+        assert participants.keys() == activities.keys()
     
-    def test_activities_have_valid_emails(self):
-        """Test that all participant emails contain @mergington.edu"""
-        for activity_name, activity_data in activities.items():
-            for participant in activity_data["participants"]:
-                assert "@mergington.edu" in participant, f"Invalid email '{participant}' in '{activity_name}'"
+    def test_activity_data_structure(self, activity_name):
+        """Test that each activity has the correct structure"""
+        activity_data = activities[activity_name]
+        
+        # Test activity name is string
+        assert isinstance(activity_name, str)
+        assert len(activity_name) > 0
+        
+        # Test activity data structure
+        assert isinstance(activity_data, dict)
+        required_fields = ["description", "schedule", "max_participants"]
+        
+        for field in required_fields:
+            assert field in activity_data, f"Missing field '{field}' in activity '{activity_name}'"
+        
+        # Test field types
+        assert isinstance(activity_data["description"], str)
+        assert isinstance(activity_data["schedule"], str)
+        assert isinstance(activity_data["max_participants"], int)
+        assert isinstance(participants[activity_name], set)
+        
+        # Test constraints
+        assert activity_data["max_participants"] > 0
+        assert len(participants[activity_name]) <= activity_data["max_participants"]
+        
+        # Test participant emails
+        for participant in participants[activity_name]:
+            assert isinstance(participant, str)
+            assert "@" in participant  # Basic email validation
+    
+    def test_activities_have_valid_emails(self, activities_summary):
+        """Test that all participant emails end with @mergington.edu"""
+        for activity_name, participant in activities_summary["participant_emails"]:
+            assert participant.endswith("@mergington.edu"), f"Invalid email '{participant}' in '{activity_name}'"
     
-    def test_no_duplicate_participants_per_activity(self):
+    def test_no_duplicate_participants_per_activity(self, activities_summary):
         """Test that there are no duplicate participants in any activity"""
-        for activity_name, activity_data in activities.items():
-            participants = activity_data["participants"]
-            unique_participants = set(participants)
-            assert len(participants) == len(unique_participants), f"Duplicate participants found in '{activity_name}'"
+        # Participants are stored as a set, so duplicates cannot exist
+        non_set = activities_summary["non_set_participants"]
+        assert not non_set, f"Participants are not stored as a set in: {non_set}"
     
-    def test_activity_capacity_constraints(self):
+    def test_activity_capacity_constraints(self, activities_summary):
         """Test that no activity exceeds its maximum capacity"""
-        for activity_name, activity_data in activities.items():
-            current_count = len(activity_data["participants"])
-            max_count = activity_data["max_participants"]
-            assert current_count <= max_count, f"Activity '{activity_name}' exceeds capacity: {current_count}/{max_count}"
+        over_capacity = activities_summary["over_capacity"]
+        assert not over_capacity, f"Activities exceed capacity (current, max): {over_capacity}"
 
 
 class TestActivityDefaultData:
     """Test specific default activities and their data"""
     
-    def test_chess_club_exists(self):
-        """Test that Chess Club exists with expected data"""
-        assert "Chess Club" in activities
-        chess_club = activities["Chess Club"]
+    @pytest.mark.parametrize("name,keyword,capacity", [
+        ("Chess Club", "chess", 12),
+        ("Programming Class", "programming", 20),
+    ])
+    def test_activity_exists(self, name, keyword, capacity):
+        """Test that a default activity exists with expected data"""
+        assert name in activities
+        activity = activities[name]
         
-        assert "chess" in chess_club["description"].lower()
-        assert chess_club["max_participants"] == 12
-        assert isinstance(chess_club["participants"], list)
-    
-    def test_programming_class_exists(self):
-        """Test that Programming Class exists with expected data"""
-        assert "Programming Class" in activities
-        programming_class = activities["Programming Class"]
-        
-        assert "programming" in programming_class["description"].lower()
-        assert programming_class["max_participants"] == 20
-        assert isinstance(programming_class["participants"], list)
+        assert keyword in activity["description"].lower()
+        assert activity["max_participants"] == capacity
+        assert isinstance(participants[name], set)
     
     def test_all_default_activities_present(self):
         """Test that all expected default activities are present"""
@@ -104,13 +112,9 @@ class TestActivityDefaultData:
 class TestDataConsistency:
     """Test data consistency across the application"""
     
-    def test_participant_email_format_consistency(self):
+    def test_participant_email_format_consistency(self, activities_summary):
         """Test that all participant emails follow the same format"""
-        all_emails = []
-        for activity_data in activities.values():
-            all_emails.extend(activity_data["participants"])
-        
-        for email in all_emails:
+        for _, email in activities_summary["participant_emails"]:
             # All should end with @mergington.edu
             assert email.endswith("@mergington.edu"), f"Email '{email}' doesn't end with @mergington.edu"
             # Should have username part
@@ -126,9 +130,7 @@ class TestDataConsistency:
     
     def test_schedules_contain_time_information(self):
         """Test that activity schedules contain time information"""
-        time_indicators = ["AM", "PM", ":", "Monday", "Tuesday", "Wednesday", "Thursday", "Friday"]
-        
         for activity_name, activity_data in activities.items():
             schedule = activity_data["schedule"]
-            has_time_info = any(indicator in schedule for indicator in time_indicators)
+            has_time_info = _TIME_RE.search(schedule) is not None
             assert has_time_info, f"Schedule for '{activity_name}' doesn't contain time information: '{schedule}'"
\ No newline at end of file
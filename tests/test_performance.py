@@ -2,60 +2,63 @@
 Performance and load tests for the FastAPI application
 """
 
+import asyncio
 import pytest
 import time
-from concurrent.futures import ThreadPoolExecutor, as_completed
+import httpx
+from src.app import app, participants
 
 
 class TestPerformance:
     """Performance tests for API endpoints"""
     
-    def test_get_activities_response_time(self, client):
+    def test_get_activities_response_time(self, benchmark, client):
         """Test that GET /activities responds within reasonable time"""
-        start_time = time.time()
-        response = client.get("/activities")
-        end_time = time.time()
-        
-        response_time = end_time - start_time
+        response = benchmark.pedantic(client.get, args=("/activities",), rounds=200, iterations=1)
         assert response.status_code == 200
-        assert response_time < 1.0, f"Response time too slow: {response_time:.3f}s"
+        
+        # Benchmarks are disabled (single call, no stats) under xdist
+        if not benchmark.disabled:
+            median = benchmark.stats["median"]
+            assert median < 0.01, f"Median response time too slow: {median * 1000:.3f}ms"
     
     def test_signup_response_time(self, client):
         """Test that signup endpoint responds within reasonable time"""
-        start_time = time.time()
+        start_time = time.perf_counter_ns()
         response = client.post("/activities/Chess Club/signup?email=performance@mergington.edu")
-        end_time = time.time()
+        end_time = time.perf_counter_ns()
         
-        response_time = end_time - start_time
+        response_time = (end_time - start_time) / 1e9
         assert response.status_code == 200
         assert response_time < 1.0, f"Signup response time too slow: {response_time:.3f}s"
     
-    def test_multiple_concurrent_signups(self, client):
+    @pytest.mark.asyncio
+    async def test_multiple_concurrent_signups(self):
         """Test handling multiple concurrent signups"""
         activity = "Programming Class"
         base_email = "concurrent{0}@mergington.edu"
         num_requests = 5
         
-        def make_signup_request(index):
-            email = base_email.format(index)
-            return client.post(f"/activities/{activity}/signup?email={email}")
-        
-        # Execute requests concurrently
-        with ThreadPoolExecutor(max_workers=num_requests) as executor:
-            futures = [executor.submit(make_signup_request, i) for i in range(num_requests)]
-            results = [future.result() for future in as_completed(futures)]
-        
-        # All requests should succeed
-        for response in results:
-            assert response.status_code == 200
+        # Issue all signups at once on a single event loop
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as ac:
+            results = await asyncio.gather(*[
+                ac.post(f"/activities/{activity}/signup", params={"email": base_email.format(i)})
+                for i in range(num_requests)
+            ])
+            
+            # All requests should succeed
+            for response in results:
+                assert response.status_code == 200
+            
+            # Verify all participants were added
+            activities_response = await ac.get("/activities")
         
-        # Verify all participants were added
-        activities_response = client.get("/activities")
-        participants = activities_response.json()[activity]["participants"]
+        signed_up = activities_response.json()[activity]["participants"]
         
         for i in range(num_requests):
             expected_email = base_email.format(i)
-            assert expected_email in participants
+            assert expected_email in signed_up
 
 
 class TestLoadHandling:
@@ -65,14 +68,18 @@ class TestLoadHandling:
         """Test handling many sequential requests"""
         num_requests = 20
         
-        for i in range(num_requests):
-            response = client.get("/activities")
-            assert response.status_code == 200
-            
-            # Ensure response is consistent
-            data = response.json()
-            assert isinstance(data, dict)
-            assert len(data) > 0
+        first_response = client.get("/activities")
+        assert first_response.status_code == 200
+        data = first_response.json()
+        assert isinstance(data, dict)
+        assert len(data) > 0
+        
+        # Repeat requests revalidate with the ETag and skip the body entirely
+        etag = first_response.headers["etag"]
+        for i in range(num_requests - 1):
+            response = client.get("/activities", headers={"If-None-Match": etag})
+            assert response.status_code == 304
+            assert response.content == b""
     
     def test_rapid_signup_unregister_cycles(self, client):
         """Test rapid signup and unregister cycles"""
@@ -85,17 +92,15 @@ class TestLoadHandling:
             signup_response = client.post(f"/activities/{activity}/signup?email={email}")
             assert signup_response.status_code == 200
             
-            # Verify signup
-            activities_response = client.get("/activities")
-            assert email in activities_response.json()[activity]["participants"]
+            # Verify signup against the in-process state
+            assert email in participants[activity]
             
             # Unregister
             unregister_response = client.delete(f"/activities/{activity}/unregister?email={email}")
             assert unregister_response.status_code == 200
             
-            # Verify unregister
-            activities_response = client.get("/activities")
-            assert email not in activities_response.json()[activity]["participants"]
+            # Verify unregister against the in-process state
+            assert email not in participants[activity]
 
 
 class TestStressScenarios:
@@ -112,11 +117,11 @@ class TestStressScenarios:
         max_capacity = activity_data["max_participants"]
         spots_available = max_capacity - current_count
         
-        # Fill all available spots
-        for i in range(spots_available):
-            email = f"stresstest{i}@mergington.edu"
-            response = client.post(f"/activities/{activity}/signup?email={email}")
-            assert response.status_code == 200
+        # Fill all available spots in one request
+        emails = [f"stresstest{i}@mergington.edu" for i in range(spots_available)]
+        response = client.post(f"/activities/{activity}/signup_bulk", json=emails)
+        assert response.status_code == 200
+        assert set(response.json()["results"].values()) == {"signed_up"}
         
         # Verify activity is now full
         final_response = client.get("/activities")
@@ -140,21 +145,20 @@ class TestStressScenarios:
         # Add participants up to a reasonable number to test
         target_participants = min(15, max_capacity - current_count)
         
-        for i in range(target_participants):
-            email = f"largelist{i}@mergington.edu"
-            response = client.post(f"/activities/{activity}/signup?email={email}")
-            assert response.status_code == 200
+        emails = [f"largelist{i}@mergington.edu" for i in range(target_participants)]
+        response = client.post(f"/activities/{activity}/signup_bulk", json=emails)
+        assert response.status_code == 200
         
         # Test that GET request still performs well with many participants
-        start_time = time.time()
+        start_time = time.perf_counter_ns()
         response = client.get("/activities")
-        end_time = time.time()
+        end_time = time.perf_counter_ns()
         
         assert response.status_code == 200
-        response_time = end_time - start_time
+        response_time = (end_time - start_time) / 1e9
         assert response_time < 2.0, f"Response too slow with many participants: {response_time:.3f}s"
         
         # Verify data integrity
         data = response.json()
-        participants = data[activity]["participants"]
-        assert len(participants) >= current_count + target_participants
\ No newline at end of file
+        signed_up = data[activity]["participants"]
+        assert len(signed_up) >= current_count + target_participants
\ No newline at end of file
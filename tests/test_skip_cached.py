@@ -0,0 +1,61 @@
+"""
+Tests for the --skip-cached bookkeeping in conftest.py
+"""
+
+from types import SimpleNamespace
+import pytest
+from tests import conftest
+
+
+class FakeCache:
+    """In-memory stand-in for pytest's config.cache"""
+    
+    def __init__(self, values=None):
+        self.values = dict(values or {})
+    
+    def get(self, key, default):
+        return self.values.get(key, default)
+    
+    def set(self, key, value):
+        self.values[key] = value
+
+
+@pytest.fixture
+def skip_cached_session(monkeypatch):
+    """A plain (non-xdist) session with --skip-cached and fresh per-run results"""
+    monkeypatch.setattr(conftest, "_passed_digests", {})
+    monkeypatch.setattr(conftest, "_failed_tests", set())
+    config = SimpleNamespace(cache=FakeCache(), getoption=lambda name: True)
+    return SimpleNamespace(config=config)
+
+
+def make_report(nodeid, when, outcome, digest="abc"):
+    return SimpleNamespace(
+        nodeid=nodeid, when=when,
+        passed=outcome == "passed", failed=outcome == "failed",
+        user_properties=[(conftest._DIGEST_PROPERTY, digest)],
+    )
+
+
+class TestSkipCachedBookkeeping:
+    """Test which results --skip-cached remembers between runs"""
+    
+    def test_passing_test_is_remembered(self, skip_cached_session):
+        """Test that a test passing every phase is stored with its digest"""
+        for when in ("setup", "call", "teardown"):
+            conftest.pytest_runtest_logreport(make_report("t::ok", when, "passed"))
+        conftest.pytest_sessionfinish(skip_cached_session)
+        
+        stored = skip_cached_session.config.cache.get(conftest._SKIP_CACHE_KEY, {})
+        assert stored == {"t::ok": "abc"}
+    
+    def test_teardown_error_is_not_remembered(self, skip_cached_session):
+        """Test that a passing call followed by a teardown error is not cached"""
+        skip_cached_session.config.cache.set(conftest._SKIP_CACHE_KEY, {"t::err": "abc"})
+        conftest.pytest_runtest_logreport(make_report("t::err", "setup", "passed"))
+        conftest.pytest_runtest_logreport(make_report("t::err", "call", "passed"))
+        conftest.pytest_runtest_logreport(make_report("t::err", "teardown", "failed"))
+        conftest.pytest_sessionfinish(skip_cached_session)
+        
+        stored = skip_cached_session.config.cache.get(conftest._SKIP_CACHE_KEY, {})
+        assert "t::err" not in stored